@@ -29,8 +29,9 @@
 
 import asyncio
 import logging
-import sys
 import threading
+import weakref
+from collections import defaultdict, deque
 from concurrent.futures import CancelledError, Future
 from enum import Enum, auto
 from typing import (
@@ -38,7 +39,8 @@ from typing import (
     Awaitable,
     Callable,
     Coroutine,
-    Dict,
+    DefaultDict,
+    Deque,
     Iterable,
     List,
     Optional,
@@ -52,19 +54,43 @@ logger = logging.getLogger(__name__)
 
 class _GuiInvoker(QObject):
     """
-    Queues function calls onto the Qt main thread via a signal/slot.
+    Queues function calls onto the Qt main thread.
+
+    Calls are pushed onto a deque (thread-safe appends) and drained in one
+    main-thread turn; a pending flag coalesces wakeups so a burst of
+    completions posts a single Qt event instead of one per call.
     """
 
-    invoke = pyqtSignal(object, tuple)
+    _drain_signal = pyqtSignal()
 
     def __init__(self):
         super().__init__()
+        self._queue: Deque[tuple] = deque()
+        # written under the GIL only; a spurious double emit is harmless
+        self._wake_pending = False
         # Always queued, even if emitted from main thread
-        self.invoke.connect(self._dispatch, Qt.ConnectionType.QueuedConnection)
+        self._drain_signal.connect(self._drain, Qt.ConnectionType.QueuedConnection)
 
-    @staticmethod
-    def _dispatch(func, args):
-        func(*args)
+    def post(self, func, args) -> None:
+        self._queue.append((func, args))
+        self._wake()
+
+    def post_batch(self, calls) -> None:
+        self._queue.extend(calls)
+        self._wake()
+
+    def _wake(self) -> None:
+        if not self._wake_pending:
+            self._wake_pending = True
+            self._drain_signal.emit()
+
+    def _drain(self) -> None:
+        # clear the flag before draining so nothing posted afterwards is lost
+        self._wake_pending = False
+        queue = self._queue
+        while queue:
+            func, args = queue.popleft()
+            func(*args)
 
 
 _GUI_INVOKER = _GuiInvoker()
@@ -72,10 +98,29 @@ _GUI_INVOKER = _GuiInvoker()
 _T = TypeVar("_T")
 _OnSuccess = Callable[[Any], None]
 _OnDone = Callable[[Any], None]
-_OnError = Callable[[tuple], None]
+_OnError = Callable[[BaseException], None]
 _Cancel = Callable[[], None]
 
 
+# empty buckets are pruned in bulk after this many completions, instead of
+# popping (and re-creating) a bucket on every burst of same-key tasks
+_PRUNE_INTERVAL = 256
+
+
+def _make_cancelled_future() -> Future:
+    fut: Future = Future()
+    # cancel() must come first: once set_running_or_notify_cancel() has moved
+    # the future to RUNNING it can no longer be cancelled
+    fut.cancel()
+    fut.set_running_or_notify_cancel()
+    return fut
+
+
+# shared immutable rejection sentinel; since it is already done, any
+# add_done_callback on it runs inline and cannot observe shared state
+_CANCELLED_FUTURE: Future = _make_cancelled_future()
+
+
 class MultipleStrategy(Enum):
     QUEUE = auto()
     REJECT_NEW_TASK = auto()
@@ -83,6 +128,18 @@ class MultipleStrategy(Enum):
     RUN_INDEPENDENT = auto()
 
 
+class _Bucket:
+    """Per-key task state, owned exclusively by the loop thread: a deque of
+    pending tasks (ordered, O(1) swap for CANCEL_OLD_TASK), a membership set
+    for O(1) cleanup, and an O(1) counter of not-yet-finished tasks, so
+    REJECT_NEW_TASK does not scan the bucket."""
+
+    def __init__(self) -> None:
+        self.futures: Deque["asyncio.Task[Any]"] = deque()
+        self.members: set = set()
+        self.active = 0
+
+
 class LoopInThread:
     """
     Runs an asyncio event loop in a daemon thread with optional key-based task strategies.
@@ -94,24 +151,44 @@ class LoopInThread:
       - run_task: callback style.
     """
 
+    _shared: Optional["LoopInThread"] = None
+    _shared_lock = threading.Lock()
+    _shared_refcount = 0
+
+    @classmethod
+    def shared(cls) -> "LoopInThread":
+        """
+        Returns a process-wide reference-counted instance, so short-lived
+        helpers don't pay for a fresh event loop + thread each time.
+        Every shared() call must be balanced by a stop().
+        """
+        with LoopInThread._shared_lock:
+            if LoopInThread._shared is None:
+                LoopInThread._shared = cls()
+            LoopInThread._shared_refcount += 1
+            return LoopInThread._shared
+
     def __init__(
         self,
     ):
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._thread: Optional[threading.Thread] = None
-        self._tasks: Dict[Future[Any], _Cancel] = {}
-        self._key_tasks: Dict[str, List[Future[Any]]] = {}
-        self._locks: Dict[str, threading.Lock] = {}
-        self._global_lock = threading.Lock()
+        # weak keys: a future that callers dropped should not be kept
+        # alive just because a cancel callback was registered for it
+        self._tasks: "weakref.WeakKeyDictionary[Future[Any], _Cancel]" = weakref.WeakKeyDictionary()
+        # touched only from the loop thread (see _keyed_runner); needs no lock
+        self._key_tasks: DefaultDict[str, _Bucket] = defaultdict(_Bucket)
+        # tasks created by this instance; shutdown iterates this instead of
+        # scanning asyncio.all_tasks() across the whole process
+        self._owned_tasks: "weakref.WeakSet[asyncio.Task[Any]]" = weakref.WeakSet()
+        # per-submitter-thread cache of the loop reference; invalidated by
+        # bumping _gen in _start()/stop()
+        self._gen = 0
+        self._tls = threading.local()
+        self._cleanups_since_prune = 0
 
         self._start()
 
-    def _get_bucket(self, key: str):
-        with self._global_lock:
-            bucket = self._key_tasks.setdefault(key, [])
-            lock = self._locks.setdefault(key, threading.Lock())
-        return bucket, lock
-
     def _start(self):
         if self._loop:
             raise RuntimeError("LoopInThread already started")
@@ -125,15 +202,26 @@ class LoopInThread:
         thread.start()
         self._loop = loop
         self._thread = thread
+        self._gen += 1
+
+    async def _tracked(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        task = asyncio.current_task()
+        if task is not None:
+            self._owned_tasks.add(task)
+        return await coro
 
     def _schedule(self, coro: Coroutine[Any, Any, _T]) -> Future[_T]:
-        if not self._loop or not self._loop.is_running():
+        # Hot path: no is_running() pre-check; a dead/missing loop raises and
+        # is handled on the (rare) error path instead of costing every call.
+        tls = self._tls.__dict__
+        if tls.get("gen") != self._gen:
+            tls["loop"] = self._loop
+            tls["gen"] = self._gen
+        try:
+            return asyncio.run_coroutine_threadsafe(self._tracked(coro), tls["loop"])
+        except (RuntimeError, AttributeError):
             logger.error("Loop is not running; cannot schedule task.")
-            fut = Future()
-            fut.set_running_or_notify_cancel()
-            fut.cancel()
-            return fut
-        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+            return _CANCELLED_FUTURE
 
     def run_background(
         self,
@@ -145,54 +233,70 @@ class LoopInThread:
         if key is None or multiple_strategy is MultipleStrategy.RUN_INDEPENDENT:
             return self._schedule(coro)
 
-        bucket, lock = self._get_bucket(key)
-        cancel_list: List[Future[Any]] = []
-
-        with lock:
-            if multiple_strategy is MultipleStrategy.REJECT_NEW_TASK:
-                if any(not f.done() for f in bucket):
-                    fut = Future()
-                    fut.set_running_or_notify_cancel()
-                    fut.cancel()
-                    return fut
-
-            if multiple_strategy is MultipleStrategy.CANCEL_OLD_TASK and bucket:
-                cancel_list = list(bucket)
-                bucket.clear()
-
-            if multiple_strategy is MultipleStrategy.QUEUE and bucket:
-                parent = bucket[-1]
+        # Keyed path: the strategy is applied inside a runner coroutine on the
+        # loop thread, so the submit side stays a single lock-free schedule.
+        return self._schedule(self._keyed_runner(coro, key, multiple_strategy))
 
-                async def wrapper() -> _T:
-                    try:
-                        await asyncio.wrap_future(parent)
-                    except Exception:
-                        pass
-                    return await coro
-
-                scheduled = wrapper()
-            else:
-                scheduled = coro
-
-            fut = self._schedule(scheduled)
-            bucket.append(fut)
-
-            def cleanup(done: Future[Any], _bucket=bucket, _lock=lock):
-                with _lock:
-                    if done in _bucket:
-                        _bucket.remove(done)
-                    if not _bucket:
-                        with self._global_lock:
-                            self._key_tasks.pop(key, None)
-                            self._locks.pop(key, None)
-
-            fut.add_done_callback(cleanup)
-
-        # cancel old tasks outside the lock to avoid deadlock
-        for old in cancel_list:
-            self.cancel_task(old)
-
-        return fut
+    async def _keyed_runner(
+        self,
+        coro: Coroutine[Any, Any, _T],
+        key: str,
+        multiple_strategy: MultipleStrategy,
+    ) -> _T:
+        """
+        Runs on the loop thread, which exclusively owns _key_tasks -- no
+        mutex is needed for any bucket mutation.
+        """
+        bucket = self._key_tasks[key]
+
+        if multiple_strategy is MultipleStrategy.REJECT_NEW_TASK and bucket.active:
+            coro.close()
+            # asyncio.CancelledError, not the concurrent.futures class: only
+            # the former marks the task (and thus the submitter's Future)
+            # cancelled; the latter would be stored as a plain exception
+            raise asyncio.CancelledError
+
+        parent: Optional["asyncio.Task[Any]"] = None
+        if multiple_strategy is MultipleStrategy.CANCEL_OLD_TASK and bucket.members:
+            old_tasks = [t for t in bucket.futures if t in bucket.members]
+            bucket.futures = deque()
+            bucket.members.clear()
+            for t in old_tasks:
+                t.cancel()
+        elif multiple_strategy is MultipleStrategy.QUEUE and bucket.futures:
+            parent = bucket.futures[-1]
+            if parent.done():
+                # nothing to wait for; skip the await (and its callback wiring)
+                parent = None
+
+        me = asyncio.current_task()
+        assert me is not None
+        bucket.futures.append(me)
+        bucket.members.add(me)
+        bucket.active += 1
+        try:
+            if parent is not None:
+                try:
+                    await parent
+                except Exception:
+                    pass
+            return await coro
+        finally:
+            bucket.active -= 1
+            bucket.members.discard(me)
+            # drop finished tasks from the front; amortized O(1)
+            futures = bucket.futures
+            while futures and futures[0] not in bucket.members:
+                futures.popleft()
+            if not bucket.members and not bucket.active:
+                # lazy pruning: bursty keys usually repopulate right away, so
+                # leave the empty bucket and sweep in bulk once in a while
+                self._cleanups_since_prune += 1
+                if self._cleanups_since_prune >= _PRUNE_INTERVAL:
+                    self._cleanups_since_prune = 0
+                    empty = [k for k, b in self._key_tasks.items() if not b.members and not b.active]
+                    for k in empty:
+                        del self._key_tasks[k]
 
     def run_parallel(
         self,
@@ -204,15 +308,17 @@ class LoopInThread:
         Schedule multiple coroutines under the same key/strategy.
         Returns an asyncio.Future you can `await` (it wraps the concurrent.Future).
         """
-        # Schedule each on the loop (concurrent.Future)
-        futures = [self.run_background(c, key=key, multiple_strategy=multiple_strategy) for c in coros]
+        coros_list = list(coros)
 
+        # Submit a single coroutine that fans out on the loop itself: one
+        # cross-thread wakeup instead of one per coroutine, and no
+        # asyncio.wrap_future per child since gather runs on the same loop.
         async def gather_all() -> List[_T]:
-            async_futs = [asyncio.wrap_future(f) for f in futures]
-            return await asyncio.gather(*async_futs)
+            loop = asyncio.get_running_loop()
+            return await asyncio.gather(*(loop.create_task(c) for c in coros_list))
 
-        # Schedule gather_all on the loop and wrap for awaiting
-        concurrent = self._schedule(gather_all())
+        # The key/strategy applies once to the whole group
+        concurrent = self.run_background(gather_all(), key=key, multiple_strategy=multiple_strategy)
         return asyncio.wrap_future(concurrent)
 
     def run_foreground(self, coro: Coroutine[Any, Any, _T]) -> _T:
@@ -228,34 +334,54 @@ class LoopInThread:
         cancel: Optional[_Cancel] = None,
         key: Optional[str] = None,
         multiple_strategy: MultipleStrategy = MultipleStrategy.RUN_INDEPENDENT,
+        main_thread: bool = True,
     ) -> Future[_T]:
+        """
+        With main_thread=False the callbacks run directly on the loop thread,
+        skipping the Qt hop entirely; they must not touch QObjects then.
+        """
         fut = self.run_background(coro, key=key, multiple_strategy=multiple_strategy)
         if cancel:
             self._tasks[fut] = cancel
 
         def _handle(f: Future[_T]):
             result = None  # ensure defined
+            # collect all callbacks and post them to the GUI thread in a
+            # single queued Qt event instead of one per callback
+            calls: List[tuple] = []
             if f.cancelled():
                 pass
             else:
                 try:
                     result = f.result()
-                except CancelledError:
+                except (CancelledError, asyncio.CancelledError):
+                    # both classes: concurrent futures raise their own
+                    # CancelledError, chained asyncio futures the BaseException
                     pass
-                except Exception:
+                except Exception as e:
                     if on_error:
-                        self._invoke_main(on_error, sys.exc_info())
+                        # pass only the exception; the callback can reach the
+                        # traceback lazily via e.__traceback__
+                        calls.append((on_error, (e,)))
                 else:
                     if on_success:
-                        self._invoke_main(on_success, result)
-            try:
-                if on_done:
-                    self._invoke_main(on_done, None if f.cancelled() else result)
-            finally:
+                        calls.append((on_success, (result,)))
+            if on_done:
+                calls.append((on_done, (None if f.cancelled() else result,)))
+            if cancel is not None:  # only touch _tasks when something was registered
                 cb = self._tasks.pop(f, None)
                 if cb:
-                    self._invoke_main(cb)
+                    calls.append((cb, ()))
+            if calls:
+                if main_thread:
+                    self._invoke_main_batch(calls)
+                else:
+                    for func, args in calls:
+                        func(*args)
 
+        # If fut is already done (e.g. a fast cache-hit coroutine),
+        # add_done_callback runs _handle inline right here -- no extra loop
+        # hop is incurred for already-completed futures.
         fut.add_done_callback(_handle)
         return fut
 
@@ -266,6 +392,14 @@ class LoopInThread:
             self._invoke_main(cb)
 
     def stop(self, timeout: float | None = 5.0) -> None:
+        # the shared instance is only really stopped by its last user
+        with LoopInThread._shared_lock:
+            if self is LoopInThread._shared:
+                LoopInThread._shared_refcount -= 1
+                if LoopInThread._shared_refcount > 0:
+                    return
+                LoopInThread._shared = None
+
         # Cancel all pending user-provided cancel callbacks
         for fut in list(self._tasks):
             self.cancel_task(fut)
@@ -278,8 +412,8 @@ class LoopInThread:
             # 1) Graceful shutdown inside the loop
             async def _graceful():
                 current = asyncio.current_task()
-                # Py3.12+: all_tasks() has no loop param
-                tasks = [t for t in asyncio.all_tasks() if t is not current]
+                # only our own tasks, not every task in the process
+                tasks = [t for t in list(self._owned_tasks) if t is not current]
                 for t in tasks:
                     t.cancel()
                 await asyncio.gather(*tasks, return_exceptions=True)
@@ -310,6 +444,7 @@ class LoopInThread:
         loop.close()
         self._loop = None
         self._thread = None
+        self._gen += 1
 
     async def _shutdown_coroutines(self):
         """
@@ -317,14 +452,18 @@ class LoopInThread:
         then await their completion (collecting exceptions).
         """
         current = asyncio.current_task()
-        tasks = [t for t in asyncio.all_tasks(loop=self._loop) if t is not current]
+        tasks = [t for t in list(self._owned_tasks) if t is not current]
         for t in tasks:
             t.cancel()
         await asyncio.gather(*tasks, return_exceptions=True)
 
     @staticmethod
     def _invoke_main(func: Callable, *args):
-        _GUI_INVOKER.invoke.emit(func, args)
+        _GUI_INVOKER.post(func, args)
+
+    @staticmethod
+    def _invoke_main_batch(calls: List[tuple]):
+        _GUI_INVOKER.post_batch(calls)
 
     def __enter__(self):
         return self
@@ -27,24 +27,83 @@
 # SOFTWARE.
 
 
+import inspect
 import logging
-from functools import lru_cache
+from functools import lru_cache, wraps
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 cached_always_keep_functions = []
 cached_functions = []
 
+# default bound for caches that are not marked always_keep
+DEFAULT_MAXSIZE = 4096
+
+_MISS = object()
+
 
 def clear_cache():
     for f in cached_functions:
         f.cache_clear()
 
 
-def register_cache(always_keep=False):
+def _fixed_arity_params(func) -> Optional[list]:
+    """Returns the parameter names if func takes only plain positional
+    parameters without defaults, else None."""
+    try:
+        params = list(inspect.signature(func).parameters.values())
+    except (TypeError, ValueError):
+        return None
+    if not params:
+        return None
+    for p in params:
+        if p.kind is not inspect.Parameter.POSITIONAL_OR_KEYWORD or p.default is not p.empty:
+            return None
+        if p.name.startswith("__rc_"):
+            # would shadow the identifiers injected by _specialized_cache
+            return None
+    return [p.name for p in params]
+
+
+def _specialized_cache(func, param_names: list):
+    """Builds a fixed-arity memoizing wrapper via exec: a hit is a plain dict
+    lookup with a bare tuple key, skipping lru_cache's generic
+    *args/**kwargs key construction."""
+    names = ", ".join(param_names)
+    cache: dict = {}
+    # every injected or local identifier carries the __rc_ prefix so it can
+    # never collide with a parameter name like `value` or `func`
+    namespace = {"__rc_func": func, "__rc_cache": cache, "__rc_cache_get": cache.get, "__rc_miss": _MISS}
+    src = (
+        f"def specialized({names}):\n"
+        f"    __rc_key = ({names},)\n"
+        f"    __rc_value = __rc_cache_get(__rc_key, __rc_miss)\n"
+        f"    if __rc_value is __rc_miss:\n"
+        f"        __rc_value = __rc_cache[__rc_key] = __rc_func({names})\n"
+        f"    return __rc_value\n"
+    )
+    exec(src, namespace)
+    specialized = wraps(func)(namespace["specialized"])
+    specialized.cache_clear = cache.clear
+    return specialized
+
+
+def register_cache(always_keep=False, maxsize: Optional[int] = None):
     def wrapper(func):
-        # Decorate the function with lru_cache
-        cached_func = lru_cache(maxsize=None)(func)
+        # Decorate the function with lru_cache.
+        # Unless the cache is explicitly always_keep (or given its own
+        # maxsize), bound it so memory cannot grow without limit.
+        size = maxsize if maxsize is not None else (None if always_keep else DEFAULT_MAXSIZE)
+        if size is None:
+            # unbounded caches with a simple fixed signature get the faster
+            # exec-generated wrapper; bounded ones need lru_cache's eviction
+            param_names = _fixed_arity_params(func)
+            cached_func = (
+                _specialized_cache(func, param_names) if param_names else lru_cache(maxsize=None)(func)
+            )
+        else:
+            cached_func = lru_cache(maxsize=size)(func)
 
         # Logging
         logger.debug(f"register_cache always_keep {always_keep}")
@@ -26,64 +26,292 @@
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import csv
-import gzip
+import hashlib
+import os
+import re
+from collections import OrderedDict
 from functools import lru_cache
-from pathlib import Path
-from typing import Callable, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
 
-from PyQt6.QtCore import QByteArray, QRectF, Qt
-from PyQt6.QtGui import QColor, QIcon, QPainter, QPalette, QPixmap
-from PyQt6.QtSvg import QSvgRenderer
+from PyQt6.QtCore import (
+    QByteArray,
+    QObject,
+    QRectF,
+    QRunnable,
+    QStandardPaths,
+    Qt,
+    QThreadPool,
+    pyqtSignal,
+)
+from PyQt6.QtGui import QColor, QIcon, QImage, QPainter, QPalette, QPixmap
 from PyQt6.QtWidgets import QApplication
 
+if TYPE_CHECKING:
+    # QtSvg (like gzip and csv below) is imported lazily at first use so
+    # merely importing this module stays cheap
+    from PyQt6.QtSvg import QSvgRenderer
+
+from .signal_tracker import SignalTracker
 from .util import is_dark_mode
 
 
+@lru_cache(maxsize=None)
+def _load_theme(theme_file: str, mtime_ns: int) -> Tuple[Tuple[str, ...], ...]:
+    "Parses the theme CSV once per file version; rows are (org, light, dark)."
+    import csv
+
+    with open(theme_file, "r") as file:
+        csv_reader = csv.reader(file)
+        all_rows = [row for row in csv_reader if row]
+    # drop the header
+    return tuple(tuple(row) for row in all_rows[1:])
+
+
+# budget for the on-disk PNG cache; pruned LRU-by-mtime once exceeded
+_DISK_CACHE_MAX_BYTES = 32 * 1024 * 1024
+_DISK_CACHE_PRUNE_INTERVAL = 64
+_saves_since_prune = 0
+
+
+def _disk_cache_path(svg_data: str, size: Tuple[int, int], dpr: float) -> Optional[str]:
+    "Stable path for the rendered PNG of this exact (svg, size, dpr)."
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    if not base:
+        return None
+    directory = os.path.join(base, "icons")
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError:
+        return None
+    key = hashlib.blake2b(
+        f"{size[0]}x{size[1]}@{dpr}|".encode() + _encoded_svg(svg_data), digest_size=16
+    ).hexdigest()
+    return os.path.join(directory, key + ".png")
+
+
+def _maybe_prune_disk_cache(directory: str) -> None:
+    global _saves_since_prune
+    _saves_since_prune += 1
+    if _saves_since_prune < _DISK_CACHE_PRUNE_INTERVAL:
+        return
+    _saves_since_prune = 0
+    try:
+        entries = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in os.scandir(directory)]
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    # oldest first
+    for mtime, size, path in sorted(entries):
+        if total <= _DISK_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+class _RenderSignals(QObject):
+    finished = pyqtSignal(object)  # carries the rasterized QImage
+
+
+# keeps signal objects alive until their queued delivery has run
+_INFLIGHT_RENDERS: set = set()
+
+
+class _SvgRenderJob(QRunnable):
+    """Rasterizes an SVG string to a QImage on a worker thread; only the
+    QImage -> QPixmap conversion stays on the GUI thread."""
+
+    def __init__(self, svg_content: str, size: Tuple[int, int], dpr: float, signals: _RenderSignals):
+        super().__init__()
+        # encode on the submitting (GUI) thread where the bytes are cached
+        self.svg_bytes = _encoded_svg(svg_content)
+        self.size = size
+        self.dpr = dpr
+        self.signals = signals
+
+    def run(self) -> None:
+        from PyQt6.QtSvg import QSvgRenderer
+
+        # per-thread renderer; the shared GUI-thread renderer cache must not
+        # be touched from here
+        renderer = QSvgRenderer(QByteArray(self.svg_bytes))
+        x, y, w, h = SvgTools._fit_rect_for(renderer, self.size)
+        tgt_w, tgt_h = self.size
+
+        image = QImage(
+            round(tgt_w * self.dpr), round(tgt_h * self.dpr), QImage.Format.Format_ARGB32_Premultiplied
+        )
+        image.setDevicePixelRatio(self.dpr)
+        image.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(image)
+        # vector -> raster at native size: no pixmap transform happens, so
+        # SmoothPixmapTransform would only add per-draw overhead
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        renderer.render(painter, QRectF(x, y, w, h))
+        painter.end()
+        self.signals.finished.emit(image)
+
+
+@lru_cache(maxsize=512)
+def _encoded_svg(svg_data: str) -> bytes:
+    "UTF-8 bytes of a themed SVG, encoded once instead of per consumer."
+    return svg_data.encode("utf-8")
+
+
+@lru_cache(maxsize=256)
+def _renderer_for(svg_data: str) -> "QSvgRenderer":
+    """Shared parsed renderer per SVG string, so requesting several sizes of
+    one icon parses the XML once. Only call from the GUI thread:
+    QSvgRenderer has thread affinity."""
+    from PyQt6.QtSvg import QSvgRenderer
+
+    return QSvgRenderer(QByteArray(_encoded_svg(svg_data)))
+
+
+def _device_pixel_ratio() -> float:
+    app = QApplication.instance()
+    screen = app.primaryScreen() if isinstance(app, QApplication) else None
+    return screen.devicePixelRatio() if screen else 1.0
+
+
+@lru_cache(maxsize=512)
+def _read_svg_cached(svg_path: str, mtime_ns: int) -> str:
+    "Decompressed/decoded SVG source, held once per file version."
+    if svg_path.lower().endswith(".svgz"):
+        import gzip
+
+        # Open the svgz file in text mode with gzip
+        with gzip.open(svg_path, "rt", encoding="utf-8") as file:
+            return file.read()
+    else:
+        # Open the file normally
+        with open(svg_path, "r", encoding="utf-8") as file:
+            return file.read()
+
+
+@lru_cache(maxsize=None)
+def _theme_substitutions(theme_file: str, mtime_ns: int, dark: bool):
+    """Precompiled alternation of all theme tokens plus the replacement map
+    for the given mode, so theming is a single pass over the SVG."""
+    mapping = {
+        org: (dark_mode if dark else light_mode)
+        for org, light_mode, dark_mode in _load_theme(theme_file, mtime_ns)
+    }
+    pattern = re.compile("|".join(re.escape(org) for org in list(mapping) + ["WindowText"]))
+    return pattern, mapping
+
+
+class ByteLRU(OrderedDict):
+    """LRU for QPixmaps bounded by estimated memory instead of entry count:
+    a 1024x1024 pixmap costs ~4 MB while a 16x16 one is negligible, so a
+    count cap either wastes memory or evicts useful entries."""
+
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+
+    @staticmethod
+    def _cost(pixmap: QPixmap) -> int:
+        # ARGB32: 4 bytes per device pixel
+        return pixmap.width() * pixmap.height() * 4
+
+    def lookup(self, key) -> Optional[QPixmap]:
+        pixmap = self.get(key)
+        if pixmap is not None:
+            self.move_to_end(key)
+        return pixmap
+
+    def put(self, key, pixmap: QPixmap) -> None:
+        old = self.pop(key, None)
+        if old is not None:
+            self.nbytes -= self._cost(old)
+        self[key] = pixmap
+        self.nbytes += self._cost(pixmap)
+        while self.nbytes > self.max_bytes and len(self) > 1:
+            _, evicted = self.popitem(last=False)
+            self.nbytes -= self._cost(evicted)
+
+    def set_limit(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        while self.nbytes > self.max_bytes and len(self) > 1:
+            _, evicted = self.popitem(last=False)
+            self.nbytes -= self._cost(evicted)
+
+    def clear(self) -> None:
+        super().clear()
+        self.nbytes = 0
+
+
+# default pixmap cache budget, in line with the on-disk PNG cache
+_PIXMAP_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
 class SvgTools:
     def __init__(self, get_icon_path: Callable[[str], str], theme_file: str) -> None:
         self.get_icon_path = get_icon_path
         self.theme_file = theme_file
+        # negative lookups: paths known to be absent or non-SVG, so repeated
+        # requests from error paths skip the stat entirely
+        self._missing: set = set()
+        # pixmaps vary wildly in size, so their cache is bounded by bytes
+        self._pixmap_cache = ByteLRU(_PIXMAP_CACHE_MAX_BYTES)
+        self._signal_tracker = SignalTracker()
+        self._connect_theme_change()
+
+    def _connect_theme_change(self) -> None:
+        # Qt 6 removed paletteChanged; colorSchemeChanged is its successor.
+        # The instance may be created before the QApplication, hence the
+        # guards; in that case callers must invalidate() themselves.
+        app = QApplication.instance()
+        if app is None:
+            return
+        try:
+            self._signal_tracker.connect(app.styleHints().colorSchemeChanged, self.invalidate)
+        except AttributeError:
+            pass
+
+    def invalidate(self) -> None:
+        """Drops all cached themed SVGs, icons and pixmaps, e.g. after a
+        light/dark mode switch; otherwise the caches would keep (and serve)
+        both themes' entries."""
+        SvgTools._themed_svg_content.cache_clear()
+        SvgTools._get_QIcon.cache_clear()
+        self._pixmap_cache.clear()
+        self._missing.clear()
+
+    def set_cache_limit_mb(self, mb: float) -> None:
+        "Adjusts the in-memory pixmap cache budget."
+        self._pixmap_cache.set_limit(int(mb * 1024 * 1024))
 
     @classmethod
     def read_source_file(cls, svg_path: str) -> str:
-        if svg_path.lower().endswith(".svgz"):
-            # Open the svgz file in text mode with gzip
-            with gzip.open(svg_path, "rt", encoding="utf-8") as file:
-                return file.read()
-        else:
-            # Open the file normally
-            with open(svg_path, "r", encoding="utf-8") as file:
-                return file.read()
+        return _read_svg_cached(svg_path, os.stat(svg_path).st_mtime_ns)
 
     def auto_theme_svg(self, svg_content: str, color: QColor | None = None) -> str:
-        with open(self.theme_file, "r") as file:
-            csv_reader = csv.reader(file)
-            all_rows = [row for row in csv_reader if row]
-            header, csv_rows = all_rows[0], all_rows[1:]
+        pattern, mapping = _theme_substitutions(
+            self.theme_file, os.stat(self.theme_file).st_mtime_ns, is_dark_mode()
+        )
 
         if color is None:
             color = QApplication.palette().color(QPalette.ColorRole.WindowText)
-        # Replace "currentColor" in the SVG with the desired color
-        replace_strings = csv_rows + [["WindowText", color.name(), color.name()]]
+        # "WindowText" is in the pattern but not the map: it is replaced with
+        # the (per-call) desired color
+        color_name = color.name()
 
-        for org, light_mode, dark_mode in replace_strings:
-            svg_content = svg_content.replace(org, dark_mode if is_dark_mode() else light_mode)
-        return svg_content
-
-    @classmethod
-    def svg_to_pixmap(cls, svg_data: str, size=(256, 256)) -> QPixmap:
-        renderer = QSvgRenderer(QByteArray(svg_data.encode("utf-8")))
-        tgt_w, tgt_h = size
+        def _replace(match: "re.Match[str]") -> str:
+            replacement = mapping.get(match.group(0))
+            return replacement if replacement is not None else color_name
 
-        # Get the SVG's natural size
-        src_size = renderer.defaultSize()
-        if src_size.width() <= 0 or src_size.height() <= 0:
-            vb = renderer.viewBoxF()
-            src_w, src_h = vb.width(), vb.height()
-        else:
-            src_w, src_h = float(src_size.width()), float(src_size.height())
+        return pattern.sub(_replace, svg_content)
 
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _fit_rect(src_w: float, src_h: float, tgt_w: int, tgt_h: int) -> Tuple[float, float, float, float]:
+        "Centered rect inscribing (src_w, src_h) into (tgt_w, tgt_h)."
         if src_w <= 0 or src_h <= 0:
             src_w = src_h = 1.0  # avoid div-by-zero for odd SVGs
 
@@ -91,20 +319,47 @@ class SvgTools:
         scale = min(tgt_w / src_w, tgt_h / src_h)
         w, h = src_w * scale, src_h * scale
         x, y = (tgt_w - w) / 2.0, (tgt_h - h) / 2.0
+        return x, y, w, h
 
-        pixmap = QPixmap(tgt_w, tgt_h)
+    @staticmethod
+    def _fit_rect_for(renderer: "QSvgRenderer", size: Tuple[int, int]) -> Tuple[float, float, float, float]:
+        "Centered rect that inscribes the SVG's natural size into `size`."
+        # the natural size is immutable per renderer; ask Qt only once
+        src = getattr(renderer, "_natural_size", None)
+        if src is None:
+            src_size = renderer.defaultSize()
+            if src_size.width() <= 0 or src_size.height() <= 0:
+                vb = renderer.viewBoxF()
+                src = (vb.width(), vb.height())
+            else:
+                src = (float(src_size.width()), float(src_size.height()))
+            renderer._natural_size = src
+        return SvgTools._fit_rect(src[0], src[1], size[0], size[1])
+
+    @classmethod
+    def svg_to_pixmap(cls, svg_data: str, size=(256, 256), dpr: float = 1.0) -> QPixmap:
+        renderer = _renderer_for(svg_data)
+        tgt_w, tgt_h = size
+        x, y, w, h = cls._fit_rect_for(renderer, size)
+
+        # render at device resolution; the painter works in logical
+        # coordinates once the pixmap carries its devicePixelRatio
+        pixmap = QPixmap(round(tgt_w * dpr), round(tgt_h * dpr))
+        pixmap.setDevicePixelRatio(dpr)
         pixmap.fill(Qt.GlobalColor.transparent)
 
         painter = QPainter(pixmap)
-        painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform)
+        # vector -> raster at native size: no pixmap transform happens, so
+        # SmoothPixmapTransform would only add per-draw overhead
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         renderer.render(painter, QRectF(x, y, w, h))  # draw into the centered, scaled rect
         painter.end()
         return pixmap
 
     @classmethod
-    def svg_to_icon(cls, svg_content: str, size=(256, 256)) -> QIcon:
+    def svg_to_icon(cls, svg_content: str, size=(256, 256), dpr: float = 1.0) -> QIcon:
         # Create an icon from the pixmap
-        pixmap = cls.svg_to_pixmap(svg_content, size)
+        pixmap = cls.svg_to_pixmap(svg_content, size, dpr=dpr)
         return QIcon(pixmap)
 
     def get_svg_content(
@@ -112,40 +367,69 @@ class SvgTools:
         icon_basename: Optional[str],
         auto_theme: bool = True,
         replace_tuples: Optional[Tuple[Tuple[str, str], ...]] = None,
+    ) -> str:
+        # dark mode is part of the cache key so theme flips re-theme the SVG
+        return self._themed_svg_content(icon_basename, auto_theme, is_dark_mode(), replace_tuples)
+
+    @lru_cache(maxsize=1000)
+    def _themed_svg_content(
+        self,
+        icon_basename: Optional[str],
+        auto_theme: bool,
+        dark_mode: bool,
+        replace_tuples: Optional[Tuple[Tuple[str, str], ...]] = None,
     ) -> str:
         if not icon_basename:
             return ""
-        icon_file = Path(self.get_icon_path(icon_basename))
-        if not icon_file.exists():
+        icon_file = self.get_icon_path(icon_basename)
+        if icon_file in self._missing:
+            return ""
+        if not icon_file.lower().endswith((".svg", ".svgz")):
+            self._missing.add(icon_file)
+            return ""
+        # a single stat replaces Path.exists() and doubles as the existence
+        # check for read_source_file's mtime key
+        try:
+            os.stat(icon_file)
+        except OSError:
+            self._missing.add(icon_file)
             return ""
 
-        if icon_file.suffix.lstrip(".") in ["svg", "svgz"]:
-            svg_content = self.read_source_file(str(icon_file))
+        svg_content = self.read_source_file(icon_file)
 
-            if replace_tuples:
-                for old_text, new_text in replace_tuples:
-                    svg_content = svg_content.replace(old_text, new_text)
+        if replace_tuples:
+            for old_text, new_text in replace_tuples:
+                svg_content = svg_content.replace(old_text, new_text)
 
-            return self.auto_theme_svg(svg_content) if auto_theme else svg_content
-        else:
-            return ""
+        return self.auto_theme_svg(svg_content) if auto_theme else svg_content
 
-    @lru_cache(maxsize=1000)
     def get_QIcon(
         self,
         icon_basename: Optional[str],
         auto_theme: bool = True,
         size: Tuple[int, int] = (256, 256),
         replace_tuples: Optional[Tuple[Tuple[str, str], ...]] = None,
+    ) -> QIcon:
+        return self._get_QIcon(icon_basename, auto_theme, size, replace_tuples, _device_pixel_ratio())
+
+    # dpr is part of the cache key so HiDPI screens get (and keep) icons
+    # rendered at device resolution instead of upscaled logical ones
+    @lru_cache(maxsize=2000)
+    def _get_QIcon(
+        self,
+        icon_basename: Optional[str],
+        auto_theme: bool,
+        size: Tuple[int, int],
+        replace_tuples: Optional[Tuple[Tuple[str, str], ...]],
+        dpr: float,
     ) -> QIcon:
         svg_content = self.get_svg_content(
             icon_basename=icon_basename, auto_theme=auto_theme, replace_tuples=replace_tuples
         )
         if not svg_content:
             return QIcon()
-        return self.svg_to_icon(svg_content, size=size)
+        return self.svg_to_icon(svg_content, size=size, dpr=dpr)
 
-    @lru_cache(maxsize=1000)
     def get_pixmap(
         self,
         icon_basename: Optional[str],
@@ -153,10 +437,82 @@ class SvgTools:
         size: Tuple[int, int] = (256, 256),
         replace_tuples: Optional[Tuple[Tuple[str, str], ...]] = None,
     ) -> QPixmap:
+        return self._get_pixmap(icon_basename, auto_theme, size, replace_tuples, _device_pixel_ratio())
+
+    def get_pixmap_async(
+        self,
+        icon_basename: Optional[str],
+        callback: Callable[[QPixmap], None],
+        auto_theme: bool = True,
+        size: Tuple[int, int] = (256, 256),
+        replace_tuples: Optional[Tuple[Tuple[str, str], ...]] = None,
+    ) -> None:
+        """
+        Rasterizes on a QThreadPool worker so a first-miss render of a large
+        SVG does not block the event loop; `callback` receives the QPixmap on
+        the GUI thread. Must be called from the GUI thread.
+        """
+        svg_content = self.get_svg_content(
+            icon_basename=icon_basename, auto_theme=auto_theme, replace_tuples=replace_tuples
+        )
+        if not svg_content:
+            callback(QPixmap())
+            return
+
+        dpr = _device_pixel_ratio()
+        key = (icon_basename, auto_theme, size, replace_tuples, dpr)
+        cached = self._pixmap_cache.lookup(key)
+        if cached is not None:
+            callback(cached)
+            return
+
+        signals = _RenderSignals()
+        _INFLIGHT_RENDERS.add(signals)
+
+        def _deliver(image: QImage) -> None:
+            _INFLIGHT_RENDERS.discard(signals)
+            # QPixmap conversion must stay on the GUI thread
+            pixmap = QPixmap.fromImage(image)
+            if not pixmap.isNull():
+                # share the result with the synchronous path
+                self._pixmap_cache.put(key, pixmap)
+            callback(pixmap)
+
+        signals.finished.connect(_deliver)
+        QThreadPool.globalInstance().start(_SvgRenderJob(svg_content, size, dpr, signals))
+
+    def _get_pixmap(
+        self,
+        icon_basename: Optional[str],
+        auto_theme: bool,
+        size: Tuple[int, int],
+        replace_tuples: Optional[Tuple[Tuple[str, str], ...]],
+        dpr: float,
+    ) -> QPixmap:
+        key = (icon_basename, auto_theme, size, replace_tuples, dpr)
+        cached = self._pixmap_cache.lookup(key)
+        if cached is not None:
+            return cached
+
         svg_content = self.get_svg_content(
             icon_basename=icon_basename, auto_theme=auto_theme, replace_tuples=replace_tuples
         )
         if not svg_content:
             return QPixmap()
 
-        return self.svg_to_pixmap(svg_content, size=size)
+        # cold-start path: a previously rendered PNG beats re-rasterizing
+        cache_path = _disk_cache_path(svg_content, size, dpr)
+        if cache_path is not None:
+            loaded = QPixmap()
+            if loaded.load(cache_path, "PNG"):
+                loaded.setDevicePixelRatio(dpr)  # not stored in the PNG
+                self._pixmap_cache.put(key, loaded)
+                return loaded
+
+        pixmap = self.svg_to_pixmap(svg_content, size=size, dpr=dpr)
+        if cache_path is not None and not pixmap.isNull():
+            pixmap.save(cache_path, "PNG")
+            _maybe_prune_disk_cache(os.path.dirname(cache_path))
+        if not pixmap.isNull():
+            self._pixmap_cache.put(key, pixmap)
+        return pixmap
@@ -28,6 +28,7 @@
 
 
 import logging
+from functools import lru_cache
 from typing import List, Literal, Optional, Tuple, Union
 
 import bdkpython as bdk
@@ -41,6 +42,10 @@ from bitcoin_safe_lib.util import color_format_str
 
 logger = logging.getLogger(__name__)
 
+# constructed once: QLocale() allocates a QObject per call
+_LOCALE = QLocale()
+_DECIMAL_POINT = _LOCALE.decimalPoint()
+
 
 def unit_str(network: bdk.Network) -> str:
     return "BTC" if network is None or network == bdk.Network.BITCOIN else "tBTC"
@@ -64,8 +69,18 @@ def format_fee_rate(fee_rate: float, network: bdk.Network) -> str:
     return f"{fee} {unit}"
 
 
+@lru_cache(maxsize=64)
+def _color_triplet(base_color_hex: str, dark: bool) -> Tuple[str, str]:
+    "Lighter/lightest variants of a base color, computed once per theme."
+    base = QColor(base_color_hex)
+    sign = -1 if dark else 1
+    return (
+        adjust_brightness(base, 0.3 * sign).name(),
+        adjust_brightness(base, 0.5 * sign).name(),
+    )
+
+
 # Main formatting function
-@register_cache()
 def format_number(
     number,
     color_formatting: Optional[Literal["html", "rich", "bash"]] = None,
@@ -73,42 +88,61 @@ def format_number(
     base_color="#000000",
     indicate_balance_change=False,
     unicode_space_character=None,
+):
+    # dark mode only matters when colors are applied; keeping it out of the
+    # key otherwise maximizes cache hits, and theme flips cannot serve stale
+    # colored strings since dark is part of the cached signature
+    dark = is_dark_mode() if color_formatting else False
+    return _format_number_cached(
+        number,
+        color_formatting,
+        include_decimal_spaces,
+        base_color,
+        indicate_balance_change,
+        unicode_space_character,
+        dark,
+    )
+
+
+@register_cache()
+def _format_number_cached(
+    number,
+    color_formatting: Optional[Literal["html", "rich", "bash"]],
+    include_decimal_spaces,
+    base_color,
+    indicate_balance_change,
+    unicode_space_character,
+    dark: bool,
 ):
     number = int(number)
-    # Split into integer and decimal parts
-    integer_part, decimal_part = f"{number/1e8:.8f}".split(".")
+    # Split into integer and decimal parts with pure integer math; no float
+    # formatting (and none of its rounding edge cases)
+    whole, frac = divmod(abs(number), 100_000_000)
+    decimal_part = f"{frac:08d}"
 
     # Format the integer part with commas or OS native separators
-    abs_integer_part_formatted = QLocale().toString(abs(int(integer_part)))
-
-    # Split the decimal part into groups
-    decimal_groups = [decimal_part[:2], decimal_part[2:5], decimal_part[5:]]
+    abs_integer_part_formatted = _LOCALE.toString(whole)
 
     # Determine color for negative numbers if indicated
     overall_color = (
         "#ff0000" if indicate_balance_change and number < 0 and base_color == "#000000" else base_color
     )
 
-    # Apply color formatting to decimal groups
+    # Apply color formatting to the three fixed decimal groups, unrolled --
+    # no loop or per-index branching on this hot path
     if color_formatting:
-        lighter_color = adjust_brightness(QColor(overall_color), 0.3 * (-1 if is_dark_mode() else 1)).name()
-        lightest_color = adjust_brightness(QColor(overall_color), 0.5 * (-1 if is_dark_mode() else 1)).name()
-
-        for i in range(len(decimal_groups)):
-            if i == len(decimal_groups) - 1:
-                color = lightest_color
-            elif i == len(decimal_groups) - 2:
-                color = lighter_color
-            else:
-                color = overall_color
-
-            decimal_groups[i] = color_format_str(decimal_groups[i], color, color_formatting)
-
-    # No color formatting applied if color_formatting is None
-    space_character = "\u00A0" if unicode_space_character else " "
-    decimal_part_formatted = (
-        space_character.join(decimal_groups) if include_decimal_spaces else "".join(decimal_groups)
-    )
+        lighter_color, lightest_color = _color_triplet(overall_color, dark)
+        group0 = color_format_str(decimal_part[:2], overall_color, color_formatting)
+        group1 = color_format_str(decimal_part[2:5], lighter_color, color_formatting)
+        group2 = color_format_str(decimal_part[5:], lightest_color, color_formatting)
+    else:
+        group0, group1, group2 = decimal_part[:2], decimal_part[2:5], decimal_part[5:]
+
+    if include_decimal_spaces:
+        space_character = "\u00A0" if unicode_space_character else " "
+        decimal_part_formatted = f"{group0}{space_character}{group1}{space_character}{group2}"
+    else:
+        decimal_part_formatted = f"{group0}{group1}{group2}"
 
     integer_part_formatted = abs_integer_part_formatted
     if number < 0:
@@ -119,7 +153,7 @@ def format_number(
     # Combine integer and decimal parts with separator
     int_part = color_format_str(integer_part_formatted, overall_color, color_formatting)
 
-    formatted_number = f"{int_part}{color_format_str(QLocale().decimalPoint(), overall_color, color_formatting)}{decimal_part_formatted}"
+    formatted_number = f"{int_part}{color_format_str(_DECIMAL_POINT, overall_color, color_formatting)}{decimal_part_formatted}"
 
     return formatted_number
 
@@ -200,17 +234,28 @@ class Satoshis:
 
     @classmethod
     def sum(cls, l: Union[List, Tuple, "Satoshis"]) -> "Satoshis":
-        def calc_satoshi(v: Union[List, Tuple, "Satoshis"]) -> Satoshis:
-            # allow recursive summing
-            return Satoshis.sum(v) if isinstance(v, (list, tuple)) else v
-
-        if not l:
-            raise ValueError("Cannot sum an empty list")
         if isinstance(l, Satoshis):
             return l
+        if not l:
+            raise ValueError("Cannot sum an empty list")
 
-        summed = calc_satoshi(l[0])
-        for v in l[1:]:
-            summed += calc_satoshi(v)
-
-        return summed
+        # flatten nested lists/tuples with an explicit stack and add the raw
+        # values in one pass, instead of allocating a Satoshis per step
+        total = 0
+        network = None
+        seen_any = False
+        stack: List[Union[List, Tuple, "Satoshis"]] = [l]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, (list, tuple)):
+                stack.extend(item)
+            else:
+                if seen_any:
+                    assert item.network == network
+                else:
+                    network = item.network
+                    seen_any = True
+                total += item.value
+        if not seen_any:
+            raise ValueError("Cannot sum an empty list")
+        return Satoshis(total, network)
@@ -27,16 +27,20 @@
 # SOFTWARE.
 
 
+import inspect
 import logging
-from typing import Any, Callable, List, Protocol, Tuple, runtime_checkable
+import weakref
+from collections import defaultdict
+from typing import Any, Callable, DefaultDict, List, Protocol, Tuple
 
-from PyQt6.QtCore import QObject, pyqtBoundSignal
+from PyQt6.QtCore import QObject, pyqtBoundSignal, pyqtSignal
 
 logger = logging.getLogger(__name__)
 
 
-@runtime_checkable
 class SignalProtocol(Protocol):
+    # typing-only: isinstance checks use the concrete pyqtBoundSignal class,
+    # which is much cheaper than a runtime_checkable Protocol
     connect: Callable[..., Any]
     disconnect: Callable[..., Any]
 
@@ -56,14 +60,19 @@ class SignalTools:
                 except TypeError:
                     break
 
-        for name in dir(object_with_bound_signals):
-            if name == "destroyed":
-                continue
-            try:
-                sig = getattr(object_with_bound_signals, name)
-            except Exception:
-                continue
-            if isinstance(sig, SignalProtocol):
+        # Signals are class-level pyqtSignal descriptors, so scanning the
+        # class dicts along the MRO yields exactly the signal names -- far
+        # cheaper than getattr on every dir() entry of a QWidget.
+        seen: set = set()
+        for klass in type(object_with_bound_signals).__mro__:
+            for name, value in klass.__dict__.items():
+                if name == "destroyed" or name in seen or not isinstance(value, pyqtSignal):
+                    continue
+                seen.add(name)
+                try:
+                    sig = getattr(object_with_bound_signals, name)
+                except Exception:
+                    continue
                 _safe_disconnect(sig)
 
     @classmethod
@@ -109,10 +118,24 @@ class SignalTools:
 
 
 class SignalTracker:
+    """Tracks signal connections per signal so they can be torn down
+    selectively or all at once.
+
+    Bound-method handlers are held through weakref.WeakMethod, mirroring
+    PyQt's own weak receiver references: once the receiver is garbage
+    collected the connection is already gone and the entry is skipped.
+    The dict is keyed by the bound-signal object itself -- PyQt hands out a
+    fresh wrapper on every attribute access, so id() would never match
+    between connect and disconnect, but the wrappers hash and compare equal
+    for the same underlying signal. Keeping them as keys also keeps them
+    strongly referenced (a weak reference to a transient wrapper would die
+    immediately).
+    """
+
     def __init__(self) -> None:
-        self._connected_signals: List[
-            Tuple[SignalProtocol, Callable[..., Any] | pyqtBoundSignal | SignalProtocol]
-        ] = []
+        self._by_signal: DefaultDict[SignalProtocol, List[Callable[..., Any] | weakref.WeakMethod]] = (
+            defaultdict(list)
+        )
 
     def connect(
         self,
@@ -121,7 +144,28 @@ class SignalTracker:
         **kwargs: Any,
     ) -> None:
         signal.connect(handler, **kwargs)
-        self._connected_signals.append((signal, handler))
+        ref = weakref.WeakMethod(handler) if inspect.ismethod(handler) else handler
+        self._by_signal[signal].append(ref)
+
+    @staticmethod
+    def _disconnect_entries(
+        signal: SignalProtocol, entries: List[Callable[..., Any] | weakref.WeakMethod]
+    ) -> None:
+        while entries:
+            ref = entries.pop()
+            handler = ref() if isinstance(ref, weakref.WeakMethod) else ref
+            if handler is None:
+                # receiver is gone; PyQt dropped the connection already
+                continue
+            SignalTools.disconnect_signal(signal, handler)
+
+    def disconnect(self, signal: SignalProtocol) -> None:
+        "Removes only the connections made through this tracker on signal."
+        entries = self._by_signal.pop(signal, None)
+        if entries:
+            self._disconnect_entries(signal, entries)
 
     def disconnect_all(self) -> None:
-        SignalTools.disconnect_signals(self._connected_signals)
+        while self._by_signal:
+            signal, entries = self._by_signal.popitem()
+            self._disconnect_entries(signal, entries)
@@ -28,10 +28,12 @@
 
 
 import logging
+from bisect import bisect_right
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Union
 
-from PyQt6.QtCore import QByteArray
+from PyQt6.QtCore import QByteArray, QLocale
 from PyQt6.QtGui import QColor, QPalette
 from PyQt6.QtWidgets import QAbstractButton, QApplication, QMessageBox, QPushButton
 
@@ -40,17 +42,47 @@ from .i18n import translate
 logger = logging.getLogger(__name__)
 
 
-def is_dark_mode() -> bool:
-    app = QApplication.instance()
-    if not isinstance(app, QApplication):
-        return False
+_APP: Optional[QApplication] = None
+
+
+def _clear_app_cache() -> None:
+    global _APP
+    _APP = None
 
-    palette = app.palette()
+
+def _get_app() -> Optional[QApplication]:
+    """Cached QApplication.instance(): the SIP bridge call is replaced by a
+    module-global load on hot paths. Cleared again on aboutToQuit."""
+    global _APP
+    if _APP is None:
+        app = QApplication.instance()
+        if isinstance(app, QApplication):
+            _APP = app
+            app.aboutToQuit.connect(_clear_app_cache)
+    return _APP
+
+
+@lru_cache(maxsize=4)
+def _is_dark(palette_cache_key: int) -> bool:
+    "Keyed on QPalette.cacheKey(): a palette swap changes the key and misses."
+    palette = QApplication.palette()
     background_color = palette.color(QPalette.ColorRole.Window)
     text_color = palette.color(QPalette.ColorRole.WindowText)
 
+    # integer perceptual luma (299R + 587G + 114B) instead of .lightness(),
+    # which converts to HSL per color
+    def luma(c: QColor) -> int:
+        return 299 * c.red() + 587 * c.green() + 114 * c.blue()
+
     # Check if the background color is darker than the text color
-    return background_color.lightness() < text_color.lightness()
+    return luma(background_color) < luma(text_color)
+
+
+def is_dark_mode() -> bool:
+    app = _get_app()
+    if app is None:
+        return False
+    return _is_dark(app.palette().cacheKey())
 
 
 def adjust_brightness(color: QColor, value: float) -> QColor:
@@ -73,18 +105,46 @@ def adjust_brightness(color: QColor, value: float) -> QColor:
     # Get the current RGB values
     r, g, b, a = color.red(), color.green(), color.blue(), color.alpha()
 
-    # Convert RGB to HSV (Hue, Saturation, Value)
-    hsv_color = color.toHsv()
-    h, s, v = hsv_color.hue(), hsv_color.saturation(), hsv_color.value()
+    # Interpolate directly in RGB toward white or black; this skips the
+    # RGB->HSV->RGB round-trip and is branch-free per channel
+    if value >= 0:
+        r = r + (255 - r) * value
+        g = g + (255 - g) * value
+        b = b + (255 - b) * value
+    else:
+        r = r * (1 + value)
+        g = g * (1 + value)
+        b = b * (1 + value)
+
+    return QColor(int(r), int(g), int(b), a)
+
+
+# (upper bound in minutes, past template, future template, divisor); a
+# divisor of None marks a fixed string, otherwise the bucket value is
+# round(distance_in_minutes / divisor). The ladder in age() used these
+# exact boundaries.
+_AGE_BUCKETS = (
+    (45, "about {} minutes ago", "in about {} minutes", 1),
+    (90, "about 1 hour ago", "in about 1 hour", None),
+    (1440, "about {} hours ago", "in about {} hours", 60),
+    (2880, "about 1 day ago", "in about 1 day", None),
+    (43220, "about {} days ago", "in about {} days", 1440),
+    (86400, "about 1 month ago", "in about 1 month", None),
+    (525600, "about {} months ago", "in about {} months", 43200),
+    (1051200, "about 1 year ago", "in about 1 year", None),
+    (float("inf"), "over {} years ago", "in over {} years", 525600),
+)
+_AGE_THRESHOLDS = [threshold for threshold, _, _, _ in _AGE_BUCKETS]
 
-    # Adjust the value (brightness)
-    new_v = max(0, min(255, v + value * 255))
 
-    # Create a new QColor with the adjusted brightness
-    new_color = QColor()
-    new_color.setHsv(h, s, int(new_v), a)
+@lru_cache(maxsize=256)
+def _translated(source_text: str, locale_name: str) -> str:
+    "Cached translate('util', ...); keyed on the locale so language switches miss."
+    return translate("util", source_text)
 
-    return new_color
+
+def _translate_cached(source_text: str) -> str:
+    return _translated(source_text, QLocale().name())
 
 
 def age(
@@ -113,67 +173,29 @@ def age(
 
     if distance_in_minutes == 0:
         if include_seconds:
-            if is_in_past:
-                return translate("util", "{} seconds ago").format(distance_in_seconds)
-            else:
-                return translate("util", "in {} seconds").format(distance_in_seconds)
-        else:
-            if is_in_past:
-                return translate("util", "less than a minute ago")
-            else:
-                return translate("util", "in less than a minute")
-    elif distance_in_minutes < 45:
-        if is_in_past:
-            return translate("util", "about {} minutes ago").format(distance_in_minutes)
-        else:
-            return translate("util", "in about {} minutes").format(distance_in_minutes)
-    elif distance_in_minutes < 90:
-        if is_in_past:
-            return translate("util", "about 1 hour ago")
-        else:
-            return translate("util", "in about 1 hour")
-    elif distance_in_minutes < 1440:
-        if is_in_past:
-            return translate("util", "about {} hours ago").format(round(distance_in_minutes / 60.0))
-        else:
-            return translate("util", "in about {} hours").format(round(distance_in_minutes / 60.0))
-    elif distance_in_minutes < 2880:
-        if is_in_past:
-            return translate("util", "about 1 day ago")
-        else:
-            return translate("util", "in about 1 day")
-    elif distance_in_minutes < 43220:
-        if is_in_past:
-            return translate("util", "about {} days ago").format(round(distance_in_minutes / 1440))
-        else:
-            return translate("util", "in about {} days").format(round(distance_in_minutes / 1440))
-    elif distance_in_minutes < 86400:
-        if is_in_past:
-            return translate("util", "about 1 month ago")
-        else:
-            return translate("util", "in about 1 month")
-    elif distance_in_minutes < 525600:
-        if is_in_past:
-            return translate("util", "about {} months ago").format(round(distance_in_minutes / 43200))
-        else:
-            return translate("util", "in about {} months").format(round(distance_in_minutes / 43200))
-    elif distance_in_minutes < 1051200:
-        if is_in_past:
-            return translate("util", "about 1 year ago")
-        else:
-            return translate("util", "in about 1 year")
-    else:
-        if is_in_past:
-            return translate("util", "over {} years ago").format(round(distance_in_minutes / 525600))
-        else:
-            return translate("util", "in over {} years").format(round(distance_in_minutes / 525600))
+            tmpl = _translate_cached("{} seconds ago" if is_in_past else "in {} seconds")
+            return tmpl.format(distance_in_seconds)
+        return _translate_cached("less than a minute ago" if is_in_past else "in less than a minute")
 
+    return _format_minutes(distance_in_minutes, is_in_past)
 
-def confirmation_wait_formatted(projected_mempool_block_index: int):
-    estimated_duration = timedelta(minutes=projected_mempool_block_index * 10)
-    estimated_duration = max(estimated_duration, timedelta(minutes=10))
 
-    return age(estimated_duration)
+def _format_minutes(distance_in_minutes: int, is_in_past: bool) -> str:
+    "Bucket formatting shared by age() and confirmation_wait_formatted."
+    # binary search over the bucket boundaries instead of the if/elif ladder
+    idx = bisect_right(_AGE_THRESHOLDS, distance_in_minutes)
+    _, past_tmpl, future_tmpl, divisor = _AGE_BUCKETS[idx]
+    tmpl = _translate_cached(past_tmpl if is_in_past else future_tmpl)
+    if divisor is None:
+        return tmpl
+    return tmpl.format(round(distance_in_minutes / divisor))
+
+
+def confirmation_wait_formatted(projected_mempool_block_index: int):
+    # the duration is already a whole number of minutes in the future, so
+    # format it directly instead of round-tripping through timedelta,
+    # datetime.now() and age()'s second arithmetic
+    return _format_minutes(max(projected_mempool_block_index * 10, 10), is_in_past=False)
 
 
 def qbytearray_to_str(a: QByteArray) -> str:
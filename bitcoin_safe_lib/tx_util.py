@@ -60,6 +60,10 @@ logger = logging.getLogger(__name__)
 
 
 def serialized_to_hex(serialized: Union[Iterable[SupportsIndex], SupportsIndex, SupportsBytes]):
+    # bytes-likes (the common bdk output) already expose .hex(); only int
+    # iterables need the bytes() conversion
+    if isinstance(serialized, (bytes, bytearray, memoryview)):
+        return serialized.hex()
     return bytes(serialized).hex()
 
 
@@ -68,7 +72,12 @@ def hex_to_serialized(hex_string: str) -> bytes:
 
 
 def hex_to_script(hex_string: str) -> bdk.Script:
-    return bdk.Script(list(bytes.fromhex(hex_string)))
+    raw = bytes.fromhex(hex_string)
+    try:
+        return bdk.Script(raw)
+    except TypeError:
+        # older bindings want a list of ints; costs one PyLong per byte
+        return bdk.Script(list(raw))
 
 
 def tx_of_psbt_to_hex(psbt: bdk.Psbt):
@@ -28,11 +28,13 @@
 
 
 import hashlib
+import itertools
 import logging
 import re
 import time
-from concurrent.futures import ThreadPoolExecutor
-from functools import wraps
+from collections import abc, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, wraps
 from pathlib import Path
 from typing import (
     Any,
@@ -47,8 +49,6 @@ from typing import (
     Union,
 )
 
-import numpy as np
-
 logger = logging.getLogger(__name__)
 
 
@@ -57,6 +57,14 @@ T2 = TypeVar("T2")
 
 
 def is_int(a: Any) -> bool:
+    # fast paths for the common typed inputs; no exception machinery and no
+    # full base-10 parse for digit strings. isdecimal() matches exactly the
+    # digits int() accepts; odd spellings (whitespace, "+", underscores)
+    # still take the slow path below
+    if isinstance(a, int):
+        return True
+    if isinstance(a, str) and (a.isdecimal() or (a.startswith("-") and a[1:].isdecimal())):
+        return True
     try:
         int(a)
     except Exception:
@@ -64,32 +72,37 @@ def is_int(a: Any) -> bool:
     return True
 
 
-def path_to_rel_home_path(path: Union[Path, str]) -> Path:
-    try:
+# Path.home() reads environment variables on every call; resolve it once
+_HOME = Path.home()
 
-        return Path(path).relative_to(Path.home())
-    except Exception as e:
-        logger.debug(str(e))
-        return Path(path)
 
-
-def rel_home_path_to_abs_path(rel_home_path: Union[Path, str]) -> Path:
-    return Path.home() / rel_home_path
+def path_to_rel_home_path(path: Union[Path, str]) -> Path:
+    p = Path(path)
+    if p.is_relative_to(_HOME):
+        return p.relative_to(_HOME)
+    return p
 
 
-def compare_dictionaries(dict1: Dict, dict2: Dict):
-    # Get unique keys from both dictionaries
-    unique_keys = set(dict1.keys()) ^ set(dict2.keys())
+def rel_home_path_to_abs_path(rel_home_path: Union[Path, str]) -> Path:
+    return _HOME / rel_home_path
 
-    # Get keys with different values
-    differing_values = {k for k in dict1 if k in dict2 and dict1[k] != dict2[k]}
 
-    # Combine unique keys and differing values
-    keys_to_include = unique_keys | differing_values
+_SENTINEL = object()
 
-    # Create a new dictionary with only the differing entries
-    result = {k: dict1.get(k, dict2.get(k)) for k in keys_to_include}
 
+def compare_dictionaries(dict1: Dict, dict2: Dict):
+    """Returns the entries where the dicts differ, preferring dict1's value
+    for keys present in both."""
+    result = {}
+    # single pass instead of symmetric-difference + comprehension + union;
+    # the sentinel keeps a stored None distinct from a missing key
+    for k, v in dict1.items():
+        v2 = dict2.get(k, _SENTINEL)
+        if v2 is _SENTINEL or v2 != v:
+            result[k] = v
+    for k, v in dict2.items():
+        if k not in dict1:
+            result[k] = v
     return result
 
 
@@ -99,37 +112,52 @@ def inv_dict(d: Dict):
 
 def all_subclasses(cls) -> Set:
     """Return all (transitive) subclasses of cls."""
-    res = set(cls.__subclasses__())
-    for sub in res.copy():
-        res |= all_subclasses(sub)
-    return res
+    seen: Set = set()
+    stack = deque(cls.__subclasses__())
+    while stack:
+        sub = stack.popleft()
+        if sub not in seen:
+            seen.add(sub)
+            stack.extend(sub.__subclasses__())
+    return seen
+
+
+_NON_ALNUM_RE = re.compile(r"\W+")
 
 
 def replace_non_alphanumeric(string: str):
-    return re.sub(r"\W+", "_", string)
+    return _NON_ALNUM_RE.sub("_", string)
 
 
+# sha256 (not a faster non-standard hash) because callers may persist the
+# digests; the cache covers the common case of re-hashing the same keys
+@lru_cache(maxsize=1024)
 def hash_string(text: str):
     return hashlib.sha256(text.encode()).hexdigest()
 
 
 def is_iterable(obj):
-    return hasattr(obj, "__iter__") or hasattr(obj, "__getitem__")
+    # C-level check with an internal subclass cache; note this no longer
+    # accepts __getitem__-only sequences (the pre-__iter__ legacy protocol)
+    return isinstance(obj, abc.Iterable)
 
 
 def time_logger(func):
+    qualname = func.__qualname__  # looked up once, not per call
+
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        if not logger.isEnabledFor(logging.DEBUG) and not logger.isEnabledFor(logging.INFO):
+            return func(*args, **kwargs)
+
+        start_time = time.perf_counter()
         result = func(*args, **kwargs)
-        end_time = time.time()
-        duration = end_time - start_time
+        duration = time.perf_counter() - start_time
 
-        message = f"Function {func.__qualname__} needed {duration:.3f}s"
-        if duration < 5e-2:
-            logger.debug(message)
-        else:
-            logger.info(message)
+        level = logging.DEBUG if duration < 5e-2 else logging.INFO
+        if logger.isEnabledFor(level):
+            # lazy %-formatting: the string is only built if the record passes
+            logger.log(level, "Function %s needed %.3fs", qualname, duration)
 
         return result
 
@@ -145,97 +173,142 @@ def threadtable(f, arglist, max_workers=20):
     return [r.result() for r in res]
 
 
+def _batched_apply(f: Callable[[T], T2], txs: List[T]) -> List[T2]:
+    return [f(tx) for tx in txs]
+
+
 @time_logger
-def threadtable_batched(f: Callable[[T], T2], txs: List[T], number_chunks=8) -> List[T2]:
-    chunks = np.array_split(np.array(txs), number_chunks)
+def threadtable_batched(
+    f: Callable[[T], T2], txs: List[T], number_chunks=8, use_processes: bool = False
+) -> List[T2]:
+    """Applies f over txs in number_chunks parallel batches.
+
+    Threads are the default: the bdk Rust bindings release the GIL, so the
+    usual callers get real parallelism without process startup or pickling.
+    Pass use_processes=True for pure-Python CPU-bound f (f and the items
+    must then be picklable).
+    """
+    # split like np.array_split: the first `rem` chunks get one extra element
+    step, rem = divmod(len(txs), number_chunks)
+    chunks = [txs[i * step + min(i, rem) : (i + 1) * step + min(i + 1, rem)] for i in range(number_chunks)]
+
+    if use_processes:
+        with ProcessPoolExecutor(max_workers=number_chunks) as executor:
+            result = list(executor.map(_batched_apply, itertools.repeat(f), chunks))
+    else:
+
+        def batched_f(txs):
+            return _batched_apply(f, txs)
+
+        result = threadtable(batched_f, chunks, max_workers=number_chunks)
+    return list(itertools.chain.from_iterable(result))
 
-    def batched_f(txs):
-        return [f(tx) for tx in txs]
 
-    result = threadtable(batched_f, chunks, max_workers=number_chunks)
-    return sum(result, [])
+def iter_clean_dict(d: Dict):
+    "Lazily yields the (key, value) pairs with truthy values."
+    return ((k, v) for k, v in d.items() if v)
 
 
 def clean_dict(d: Dict):
     return {k: v for k, v in d.items() if v}
 
 
+def iter_clean_list(l: Iterable[T | None]) -> Iterable[T]:
+    "Lazily yields the truthy items; saves the list for iterate-once callers."
+    return (v for v in l if v)
+
+
 def clean_list(l: Iterable[T | None]) -> List[T]:
     "removes none items off a list"
     return [v for v in l if v]
 
 
-def remove_duplicates_keep_order(seq):
-    seen = set()
-    result = []
+def iter_unique(seq: Iterable[T]) -> Iterable[T]:
+    "Lazily yields the first occurrence of each item, preserving order."
+    seen: Set = set()
     for item in seq:
         if item not in seen:
             seen.add(item)
-            result.append(item)
-    return result
+            yield item
+
+
+def remove_duplicates_keep_order(seq):
+    # dict preserves insertion order; one C-level pass instead of a Python
+    # loop with a set lookup plus an append per item
+    return list(dict.fromkeys(seq))
 
 
 # Helper function to lighten a color
+@lru_cache(maxsize=512)
 def lighten_color(hex_color: str, factor: float):
-    r = int(hex_color[1:3], 16)
-    g = int(hex_color[3:5], 16)
-    b = int(hex_color[5:7], 16)
+    # one 6-digit hex parse and one formatted output instead of three each
+    v = int(hex_color[1:7], 16)
+    r, g, b = (v >> 16) & 0xFF, (v >> 8) & 0xFF, v & 0xFF
     r = int(r + (255 - r) * factor)
     g = int(g + (255 - g) * factor)
     b = int(b + (255 - b) * factor)
-    return f"#{r:02x}{g:02x}{b:02x}"
+    return f"#{(r << 16) | (g << 8) | b:06x}"
+
+
+# ANSI color codes and their RGB values
+_ANSI_COLORS = (
+    (30, 0, 0, 0),  # Black
+    (31, 128, 0, 0),  # Red
+    (32, 0, 128, 0),  # Green
+    (33, 128, 128, 0),  # Yellow
+    (34, 0, 0, 128),  # Blue
+    (35, 128, 0, 128),  # Magenta
+    (36, 0, 128, 128),  # Cyan
+    (37, 192, 192, 192),  # Light gray
+    (90, 128, 128, 128),  # Dark gray
+    (91, 255, 0, 0),  # Light red
+    (92, 0, 255, 0),  # Light green
+    (93, 255, 255, 0),  # Light yellow
+    (94, 0, 0, 255),  # Light blue
+    (95, 255, 0, 255),  # Light magenta
+    (96, 0, 255, 255),  # Light cyan
+    (97, 255, 255, 255),  # White
+)
 
 
+@lru_cache(maxsize=512)
 def hex_to_ansi(hex_color: str):
     """Convert hex color to closest ANSI color."""
-    # Mapping of ANSI color codes to RGB values
-    ansi_colors = {
-        30: (0, 0, 0),  # Black
-        31: (128, 0, 0),  # Red
-        32: (0, 128, 0),  # Green
-        33: (128, 128, 0),  # Yellow
-        34: (0, 0, 128),  # Blue
-        35: (128, 0, 128),  # Magenta
-        36: (0, 128, 128),  # Cyan
-        37: (192, 192, 192),  # Light gray
-        90: (128, 128, 128),  # Dark gray
-        91: (255, 0, 0),  # Light red
-        92: (0, 255, 0),  # Light green
-        93: (255, 255, 0),  # Light yellow
-        94: (0, 0, 255),  # Light blue
-        95: (255, 0, 255),  # Light magenta
-        96: (0, 255, 255),  # Light cyan
-        97: (255, 255, 255),  # White
-    }
-
     # Convert hex to RGB
     r, g, b = int(hex_color[1:3], 16), int(hex_color[3:5], 16), int(hex_color[5:7], 16)
 
     # Find the closest ANSI color
     closest_ansi = min(
-        ansi_colors,
-        key=lambda k: (r - ansi_colors[k][0]) ** 2
-        + (g - ansi_colors[k][1]) ** 2
-        + (b - ansi_colors[k][2]) ** 2,
+        _ANSI_COLORS,
+        key=lambda c: (r - c[1]) ** 2 + (g - c[2]) ** 2 + (b - c[3]) ** 2,
     )
-    return closest_ansi
+    return closest_ansi[0]
 
 
-# New function to apply color formatting to a string
-def color_format_str(
-    s, hex_color="#000000", color_formatting: Optional[Literal["html", "rich", "bash"]] = "rich"
-):
+@lru_cache(maxsize=256)
+def _fmt_wrap(hex_color: str, color_formatting: Optional[Literal["html", "rich", "bash"]]):
+    "(prefix, suffix) pair wrapping a string in the given color and markup."
     if hex_color == "#000000":
-        return s
+        return "", ""
     if color_formatting == "html":
-        return f'<span style="color:{hex_color}">{s}</span>'
+        return f'<span style="color:{hex_color}">', "</span>"
     if color_formatting == "rich":
-        return f'<font color="{hex_color}">{s}</font>'
+        return f'<font color="{hex_color}">', "</font>"
     if color_formatting == "bash":
-        ansi_code = hex_to_ansi(hex_color)
-        return f"\033[{ansi_code}m{s}\033[0m"
+        return f"\033[{hex_to_ansi(hex_color)}m", "\033[0m"
+    return "", ""
+
 
-    return s
+# New function to apply color formatting to a string
+def color_format_str(
+    s, hex_color="#000000", color_formatting: Optional[Literal["html", "rich", "bash"]] = "rich"
+):
+    # the wrapping markup only depends on (color, mode), so it is cached and
+    # the hot path is a single f-string join
+    pre, post = _fmt_wrap(hex_color, color_formatting)
+    if not pre:
+        return s
+    return f"{pre}{s}{post}"
 
 
 def unique_elements(iterable: Iterable):